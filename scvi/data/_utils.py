@@ -1,6 +1,6 @@
 import logging
 import warnings
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from uuid import uuid4
 
 import h5py
@@ -140,6 +140,23 @@ def get_anndata_attribute(
     return field
 
 
+def _get_label_codes(adata_manager) -> Tuple[np.ndarray, int]:
+    """Returns the registered integer label codes and the code of the unlabeled category.
+
+    Comparing the registered codes avoids an elementwise comparison of the original,
+    potentially object-typed, labels.
+    """
+    labels_state_registry = adata_manager.get_state_registry(REGISTRY_KEYS.LABELS_KEY)
+    codes = np.asarray(
+        adata_manager.get_from_registry(REGISTRY_KEYS.LABELS_KEY)
+    ).ravel()
+    mapping = np.asarray(labels_state_registry.categorical_mapping)
+    unlabeled_code = int(
+        np.flatnonzero(mapping == labels_state_registry.unlabeled_category)[0]
+    )
+    return codes, unlabeled_code
+
+
 def _set_data_in_registry(
     adata: AnnData,
     data: Union[np.ndarray, pd.DataFrame],
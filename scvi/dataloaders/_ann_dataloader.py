@@ -59,7 +59,8 @@ class AnnDataLoader(DataLoader):
     load_sparse_tensor
         `EXPERIMENTAL` If ``True``, loads data with sparse CSR or CSC layout as a
         :class:`~torch.Tensor` with the same layout. Can lead to speedups in data transfers to GPUs,
-        depending on the sparsity of the data.
+        depending on the sparsity of the data. Not supported with ``num_workers > 0``, as
+        sparse tensors cannot be shared between worker processes.
     **kwargs
         Additional keyword arguments passed into :class:`~torch.utils.data.DataLoader`.
 
@@ -86,6 +87,11 @@ class AnnDataLoader(DataLoader):
         load_sparse_tensor: bool = False,
         **kwargs,
     ):
+        if load_sparse_tensor and kwargs.get("num_workers", 0) > 0:
+            raise ValueError(
+                "`load_sparse_tensor=True` is not supported with `num_workers > 0`, as "
+                "sparse tensors cannot be shared between worker processes."
+            )
         if indices is None:
             indices = np.arange(adata_manager.adata.shape[0])
         else:
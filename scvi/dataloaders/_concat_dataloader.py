@@ -1,8 +1,9 @@
-from itertools import cycle
+from itertools import count
+from math import ceil
 from typing import List, Optional, Union
 
 import numpy as np
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, DistributedSampler
 
 from scvi.data import AnnDataManager
 
@@ -26,6 +27,13 @@ class ConcatDataLoader(DataLoader):
         Dictionary with keys representing keys in data registry (``adata_manager.data_registry``)
         and value equal to desired numpy loading type (later made into torch tensor).
         If ``None``, defaults to all registered data.
+    distributed_sampler
+        Whether to use :class:`~scvi.dataloaders.BatchDistributedSampler` as the sampler
+        for each of the underlying :class:`~scvi.dataloaders.AnnDataLoader` instances.
+    load_sparse_tensor
+        `EXPERIMENTAL` If ``True``, loads data with sparse CSR or CSC layout as a
+        :class:`~torch.Tensor` with the same layout. Can lead to speedups in data transfers to
+        GPUs, depending on the sparsity of the data.
     data_loader_kwargs
         Keyword arguments for :class:`~torch.utils.data.DataLoader`
     """
@@ -38,6 +46,8 @@ class ConcatDataLoader(DataLoader):
         batch_size: int = 128,
         data_and_attributes: Optional[dict] = None,
         drop_last: Union[bool, int] = False,
+        distributed_sampler: bool = False,
+        load_sparse_tensor: bool = False,
         **data_loader_kwargs,
     ):
         self.adata_manager = adata_manager
@@ -46,9 +56,16 @@ class ConcatDataLoader(DataLoader):
         self._shuffle = shuffle
         self._batch_size = batch_size
         self._drop_last = drop_last
+        self._distributed_sampler = distributed_sampler
+        self._load_sparse_tensor = load_sparse_tensor
 
+        # the number of minibatches grows with the number of indices
+        largest = np.argmax([len(indices) for indices in indices_list])
         self.dataloaders = []
-        for indices in indices_list:
+        for i, indices in enumerate(indices_list):
+            kwargs = self.dataloader_kwargs
+            if i != largest:
+                kwargs = _cycled_data_loader_kwargs(kwargs)
             self.dataloaders.append(
                 AnnDataLoader(
                     adata_manager,
@@ -57,11 +74,21 @@ class ConcatDataLoader(DataLoader):
                     batch_size=batch_size,
                     data_and_attributes=data_and_attributes,
                     drop_last=drop_last,
-                    **self.dataloader_kwargs,
+                    distributed_sampler=distributed_sampler,
+                    load_sparse_tensor=load_sparse_tensor,
+                    **kwargs,
                 )
             )
-        lens = [len(dl) for dl in self.dataloaders]
-        self.largest_dl = self.dataloaders[np.argmax(lens)]
+        self.largest_dl = self.dataloaders[largest]
+        if distributed_sampler:
+            # expose the sharded sampler so lightning does not inject its own and
+            # forwards `set_epoch` calls to the largest data loader, whose epoch is
+            # passed on to the other data loaders in `__iter__`
+            data_loader_kwargs = {
+                **data_loader_kwargs,
+                "sampler": self.largest_dl.sampler,
+                "batch_size": None,
+            }
         super().__init__(self.largest_dl, **data_loader_kwargs)
 
     def __len__(self):
@@ -74,7 +101,43 @@ class ConcatDataLoader(DataLoader):
         the data in the other dataloaders. The order of data in returned iter_list
         is the same as indices_list.
         """
-        iter_list = [
-            cycle(dl) if dl != self.largest_dl else dl for dl in self.dataloaders
-        ]
+        epoch = getattr(self.largest_dl.sampler, "epoch", 0)
+        iter_list = []
+        for dl in self.dataloaders:
+            if dl == self.largest_dl:
+                iter_list.append(dl)
+            else:
+                n_passes = ceil(len(self.largest_dl) / max(len(dl), 1))
+                iter_list.append(_cycle(dl, epoch=epoch, n_passes=n_passes))
         return zip(*iter_list)
+
+
+def _cycled_data_loader_kwargs(data_loader_kwargs: dict) -> dict:
+    """Keyword arguments for a data loader that is cycled through with :func:`_cycle`.
+
+    Each pass calls `iter` on the data loader again, which would start a new pool of
+    worker processes every time. Workers are therefore kept alive across passes if
+    `num_workers > 0`.
+    """
+    if data_loader_kwargs.get("num_workers", 0) > 0:
+        return {**data_loader_kwargs, "persistent_workers": True}
+    return data_loader_kwargs
+
+
+def _cycle(dl: DataLoader, epoch: int = 0, n_passes: int = 1):
+    """Iterate over a dataloader indefinitely.
+
+    In contrast to :func:`itertools.cycle`, minibatches are not cached after the first
+    pass, so each pass draws a fresh (reshuffled) set of minibatches and the smaller
+    dataloaders do not hold all of their data in memory.
+
+    If `dl` uses a :class:`~torch.utils.data.DistributedSampler`, its epoch is set to
+    `epoch * n_passes + i` on the i-th pass, so that every pass of every epoch is
+    reshuffled in the same way across replicas.
+    """
+    if len(dl) == 0:
+        return
+    for i in count():
+        if isinstance(dl.sampler, DistributedSampler):
+            dl.sampler.set_epoch(epoch * n_passes + i)
+        yield from dl
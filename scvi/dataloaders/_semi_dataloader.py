@@ -2,12 +2,11 @@ from typing import List, Optional, Union
 
 import numpy as np
 
-from scvi import REGISTRY_KEYS
 from scvi.data import AnnDataManager
-from scvi.data._utils import get_anndata_attribute
+from scvi.data._utils import _get_label_codes
 
 from ._ann_dataloader import AnnDataLoader
-from ._concat_dataloader import ConcatDataLoader
+from ._concat_dataloader import ConcatDataLoader, _cycled_data_loader_kwargs
 
 
 class SemiSupervisedDataLoader(ConcatDataLoader):
@@ -30,6 +29,13 @@ class SemiSupervisedDataLoader(ConcatDataLoader):
         Dictionary with keys representing keys in data registry (`adata_manager.data_registry`)
         and value equal to desired numpy loading type (later made into torch tensor).
         If `None`, defaults to all registered data.
+    distributed_sampler
+        Whether to use :class:`~scvi.dataloaders.BatchDistributedSampler` as the sampler
+        for both the full and the labelled data loaders.
+    load_sparse_tensor
+        `EXPERIMENTAL` If ``True``, loads data with sparse CSR or CSC layout as a
+        :class:`~torch.Tensor` with the same layout. Can lead to speedups in data transfers to
+        GPUs, depending on the sparsity of the data.
     data_loader_kwargs
         Keyword arguments for :class:`~torch.utils.data.DataLoader`
     """
@@ -43,6 +49,8 @@ class SemiSupervisedDataLoader(ConcatDataLoader):
         batch_size: int = 128,
         data_and_attributes: Optional[dict] = None,
         drop_last: Union[bool, int] = False,
+        distributed_sampler: bool = False,
+        load_sparse_tensor: bool = False,
         **data_loader_kwargs,
     ):
         adata = adata_manager.adata
@@ -56,20 +64,14 @@ class SemiSupervisedDataLoader(ConcatDataLoader):
 
         self.n_samples_per_label = n_samples_per_label
 
-        labels_state_registry = adata_manager.get_state_registry(
-            REGISTRY_KEYS.LABELS_KEY
-        )
-        labels = get_anndata_attribute(
-            adata_manager.adata,
-            adata_manager.data_registry.labels.attr_name,
-            labels_state_registry.original_key,
-        ).ravel()
+        codes, unlabeled_code = _get_label_codes(adata_manager)
+        codes = codes[self.indices]
 
         # save a nested list of the indices per labeled category
         self.labeled_locs = []
-        for label in np.unique(labels):
-            if label != labels_state_registry.unlabeled_category:
-                label_loc_idx = np.where(labels[indices] == label)[0]
+        for code in np.unique(codes):
+            if code != unlabeled_code:
+                label_loc_idx = np.flatnonzero(codes == code)
                 label_loc = self.indices[label_loc_idx]
                 self.labeled_locs.append(label_loc)
         labelled_idx = self.subsample_labels()
@@ -81,6 +83,8 @@ class SemiSupervisedDataLoader(ConcatDataLoader):
             batch_size=batch_size,
             data_and_attributes=data_and_attributes,
             drop_last=drop_last,
+            distributed_sampler=distributed_sampler,
+            load_sparse_tensor=load_sparse_tensor,
             **data_loader_kwargs,
         )
 
@@ -97,6 +101,9 @@ class SemiSupervisedDataLoader(ConcatDataLoader):
             batch_size=self._batch_size,
             data_and_attributes=self.data_and_attributes,
             drop_last=self._drop_last,
+            distributed_sampler=self._distributed_sampler,
+            load_sparse_tensor=self._load_sparse_tensor,
+            **_cycled_data_loader_kwargs(self.dataloader_kwargs),
         )
 
     def subsample_labels(self):
@@ -55,7 +55,6 @@ def log_zinb_positive(
     pi_theta_log = -pi + theta * (log_theta_eps - log_theta_mu_eps)
 
     case_zero = F.softplus(pi_theta_log) - softplus_pi
-    mul_case_zero = torch.mul((x < eps).type(torch.float32), case_zero)
 
     case_non_zero = (
         -softplus_pi
@@ -65,9 +64,10 @@ def log_zinb_positive(
         - torch.lgamma(theta)
         - torch.lgamma(x + 1)
     )
-    mul_case_non_zero = torch.mul((x > eps).type(torch.float32), case_non_zero)
 
-    res = mul_case_zero + mul_case_non_zero
+    # select rather than mask and add, which avoids materializing two float masks and
+    # lets the whole expression be fused into a single elementwise kernel when compiled
+    res = torch.where(x < eps, case_zero, case_non_zero)
 
     return res
 
@@ -18,7 +18,7 @@ from scvi.data._constants import (
     _SETUP_ARGS_KEY,
     ADATA_MINIFY_TYPE,
 )
-from scvi.data._utils import _get_adata_minify_type, _is_minified, get_anndata_attribute
+from scvi.data._utils import _get_adata_minify_type, _get_label_codes, _is_minified
 from scvi.data.fields import (
     BaseAnnDataField,
     CategoricalJointObsField,
@@ -31,7 +31,11 @@ from scvi.data.fields import (
     StringUnsField,
 )
 from scvi.dataloaders import SemiSupervisedDataSplitter
-from scvi.model._utils import _init_library_size, get_max_epochs_heuristic
+from scvi.model._utils import (
+    _init_library_size,
+    get_max_epochs_heuristic,
+    use_distributed_sampler,
+)
 from scvi.model.utils import get_minified_adata_scrna
 from scvi.module import SCANVAE
 from scvi.train import SemiSupervisedTrainingPlan, TrainRunner
@@ -48,6 +52,40 @@ _SCANVI_OBSERVED_LIB_SIZE = "_scanvi_observed_lib_size"
 
 logger = logging.getLogger(__name__)
 
+# number of float32 copies of a cell's counts budgeted per cell (inputs, transfers and
+# intermediate activations) when scaling the prediction minibatch size to GPU memory
+_PREDICT_MEMORY_SAFETY_FACTOR = 16
+# upper bound on the scaled prediction minibatch size as a multiple of
+# `settings.batch_size`, since each minibatch is densified and pinned in host memory
+_PREDICT_MAX_BATCH_SIZE_MULTIPLE = 32
+# submodules of SCANVAE used to classify cells, quantized for CPU prediction
+_CLASSIFY_SUBMODULES = ("z_encoder", "classifier", "classifier_groups")
+
+
+def _share_module_weights(source: torch.nn.Module, target: torch.nn.Module):
+    """Make `target` reuse the submodules and parameters it has in common with `source`.
+
+    Shared tensors are assigned by reference, so no copy of the weights is made.
+    Buffers are small and copied as in :meth:`~torch.nn.Module.load_state_dict`.
+    """
+    target_state_dict = target.state_dict()
+    for key, value in source.state_dict().items():
+        if key in target_state_dict and target_state_dict[key].shape != value.shape:
+            raise ValueError(
+                f"Cannot share weights for `{key}` with shapes {tuple(value.shape)} and "
+                f"{tuple(target_state_dict[key].shape)}."
+            )
+
+    for name, child in source.named_children():
+        if hasattr(target, name):
+            setattr(target, name, child)
+    for name, param in source.named_parameters(recurse=False):
+        if hasattr(target, name):
+            setattr(target, name, param)
+    for name, buffer in source.named_buffers(recurse=False):
+        if hasattr(target, name):
+            getattr(target, name).copy_(buffer)
+
 
 class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
     """Single-cell annotation using variational inference :cite:p:`Xu21`.
@@ -189,6 +227,7 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
         unlabeled_category: str,
         labels_key: str | None = None,
         adata: AnnData | None = None,
+        share_weights: bool = False,
         **scanvi_kwargs,
     ):
         """Initialize scanVI model with weights from pretrained :class:`~scvi.model.SCVI` model.
@@ -205,6 +244,11 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
             Value used for unlabeled cells in `labels_key` used to setup AnnData with scvi.
         adata
             AnnData object that has been registered via :meth:`~scvi.model.SCANVI.setup_anndata`.
+        share_weights
+            If `True`, the encoder and decoder modules of the scANVI model are the same
+            objects as those of `scvi_model` instead of copies, avoiding a copy of the
+            pretrained weights. Note that further training of the scANVI model then also
+            updates the weights of `scvi_model`.
         scanvi_kwargs
             kwargs for scANVI model
         """
@@ -256,8 +300,12 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
             **scvi_setup_args,
         )
         scanvi_model = cls(adata, **non_kwargs, **kwargs, **scanvi_kwargs)
-        scvi_state_dict = scvi_model.module.state_dict()
-        scanvi_model.module.load_state_dict(scvi_state_dict, strict=False)
+        if share_weights:
+            _share_module_weights(scvi_model.module, scanvi_model.module)
+            scanvi_model.to_device(scvi_model.device)
+        else:
+            scvi_state_dict = scvi_model.module.state_dict()
+            scanvi_model.module.load_state_dict(scvi_state_dict, strict=False)
         scanvi_model.was_pretrained = True
 
         return scanvi_model
@@ -270,20 +318,17 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
         self.original_label_key = labels_state_registry.original_key
         self.unlabeled_category_ = labels_state_registry.unlabeled_category
 
-        labels = get_anndata_attribute(
-            self.adata,
-            self.adata_manager.data_registry.labels.attr_name,
-            self.original_label_key,
-        ).ravel()
-        self._label_mapping = labels_state_registry.categorical_mapping
+        # convert through a list once so string labels have a fixed-width unicode dtype
+        self._label_mapping = np.array(list(labels_state_registry.categorical_mapping))
+
+        codes, unlabeled_code = _get_label_codes(self.adata_manager)
 
         # set unlabeled and labeled indices
-        self._unlabeled_indices = np.argwhere(
-            labels == self.unlabeled_category_
-        ).ravel()
-        self._labeled_indices = np.argwhere(labels != self.unlabeled_category_).ravel()
-        self._code_to_label = dict(enumerate(self._label_mapping))
+        unlabeled_mask = codes == unlabeled_code
+        self._unlabeled_indices = np.flatnonzero(unlabeled_mask)
+        self._labeled_indices = np.flatnonzero(~unlabeled_mask)
 
+    @torch.inference_mode()
     def predict(
         self,
         adata: AnnData | None = None,
@@ -291,6 +336,7 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
         soft: bool = False,
         batch_size: int | None = None,
         use_posterior_mean: bool = True,
+        quantize: bool = False,
     ) -> np.ndarray | pd.DataFrame:
         """Return cell label predictions.
 
@@ -304,20 +350,41 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
             If True, returns per class probabilities
         batch_size
             Minibatch size for data loading into model. Defaults to `scvi.settings.batch_size`.
+            If ``None`` and the model is on a GPU, the minibatch size is instead scaled to
+            the free GPU memory, between `scvi.settings.batch_size` and 32 times that
+            value, and never larger than the number of cells to predict.
         use_posterior_mean
             If ``True``, uses the mean of the posterior distribution to predict celltype
             labels. Otherwise, uses a sample from the posterior distribution - this
             means that the predictions will be stochastic.
+        quantize
+            If ``True``, uses a copy of the module with linear layers dynamically
+            quantized to int8 (:func:`~torch.quantization.quantize_dynamic`). Can speed
+            up prediction on CPU at a small cost in accuracy. Only supported if the
+            model is on CPU.
         """
         adata = self._validate_anndata(adata)
+        if quantize:
+            if torch.device(self.device).type != "cpu":
+                raise ValueError(
+                    "Quantized prediction is only supported on CPU. Move the model with "
+                    "`model.to_device('cpu')` first."
+                )
+            module = self._get_quantized_module()
+        else:
+            module = self.module
 
         if indices is None:
             indices = np.arange(adata.n_obs)
+        if batch_size is None:
+            batch_size = self._get_predict_batch_size(len(indices))
 
+        # pinned memory lets host to device copies overlap with compute on GPU
         scdl = self._make_data_loader(
             adata=adata,
             indices=indices,
             batch_size=batch_size,
+            pin_memory=torch.device(self.device).type == "cuda",
         )
         y_pred = []
         for _, tensors in enumerate(scdl):
@@ -330,7 +397,7 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
             cat_key = REGISTRY_KEYS.CAT_COVS_KEY
             cat_covs = tensors[cat_key] if cat_key in tensors.keys() else None
 
-            pred = self.module.classify(
+            pred = module.classify(
                 x,
                 batch_index=batch,
                 cat_covs=cat_covs,
@@ -343,20 +410,56 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
 
         y_pred = torch.cat(y_pred).numpy()
         if not soft:
-            predictions = []
-            for p in y_pred:
-                predictions.append(self._code_to_label[p])
-
-            return np.array(predictions)
+            return self._label_mapping[y_pred]
         else:
-            n_labels = len(pred[0])
+            n_labels = y_pred.shape[1]
+            # wrap the float32 probabilities without an upcast or copy
             pred = pd.DataFrame(
-                y_pred,
+                np.ascontiguousarray(y_pred, dtype=np.float32),
                 columns=self._label_mapping[:n_labels],
                 index=adata.obs_names[indices],
+                copy=False,
             )
             return pred
 
+    def _get_quantized_module(self) -> SCANVAE:
+        """Return an int8 dynamically quantized copy of the module for CPU inference.
+
+        The copy is created from the current weights on every call, so it never goes
+        stale. Only the submodules used by :meth:`~scvi.module.SCANVAE.classify` are
+        copied and quantized, the others are shared with the full precision module,
+        which is left untouched.
+        """
+        # share unused submodules (e.g. the decoder) instead of copying them
+        memo = {
+            id(child): child
+            for name, child in self.module.named_children()
+            if name not in _CLASSIFY_SUBMODULES
+        }
+        module = deepcopy(self.module, memo)
+        return torch.quantization.quantize_dynamic(
+            module, set(_CLASSIFY_SUBMODULES), dtype=torch.qint8, inplace=True
+        )
+
+    def _get_predict_batch_size(self, n_obs: int) -> int:
+        """Return the default minibatch size for :meth:`predict`.
+
+        On CPU this is `scvi.settings.batch_size`. On GPU, the minibatch size is scaled
+        to the free device memory, allowing for `_PREDICT_MEMORY_SAFETY_FACTOR` float32
+        copies of each cell's counts. It is kept between `scvi.settings.batch_size` and
+        `_PREDICT_MAX_BATCH_SIZE_MULTIPLE` times that value, and capped at `n_obs`.
+        """
+        device = torch.device(self.device)
+        if device.type != "cuda":
+            return settings.batch_size
+
+        free_memory, _ = torch.cuda.mem_get_info(device)
+        bytes_per_obs = 4 * self.summary_stats.n_vars * _PREDICT_MEMORY_SAFETY_FACTOR
+        max_batch_size = _PREDICT_MAX_BATCH_SIZE_MULTIPLE * settings.batch_size
+        batch_size = max(settings.batch_size, free_memory // bytes_per_obs)
+        batch_size = min(batch_size, max_batch_size)
+        return int(min(batch_size, max(n_obs, 1)))
+
     @devices_dsp.dedent
     def train(
         self,
@@ -366,6 +469,7 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
         train_size: float = 0.9,
         validation_size: float | None = None,
         shuffle_set_split: bool = True,
+        load_sparse_tensor: bool = False,
         batch_size: int = 128,
         accelerator: str = "auto",
         devices: int | list[int] | str = "auto",
@@ -394,24 +498,36 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
         shuffle_set_split
             Whether to shuffle indices before splitting. If `False`, the val, train, and test set are split in the
             sequential order of the data according to `validation_size` and `train_size` percentages.
+        load_sparse_tensor
+            `EXPERIMENTAL` If ``True``, loads data with sparse CSR or CSC layout as a
+            :class:`~torch.Tensor` with the same layout. Can lead to speedups in data transfers to
+            GPUs, depending on the sparsity of the data. Cannot be combined with
+            ``num_workers > 0`` in `datasplitter_kwargs`.
         batch_size
             Minibatch size to use during training.
         %(param_accelerator)s
         %(param_devices)s
         datasplitter_kwargs
             Additional keyword arguments passed into
-            :class:`~scvi.dataloaders.SemiSupervisedDataSplitter`.
+            :class:`~scvi.dataloaders.SemiSupervisedDataSplitter`. For AnnData objects
+            in backed mode, passing e.g. ``num_workers=2`` and ``pin_memory=True`` loads
+            minibatches in background workers while the model trains. Workers are not
+            supported with ``load_sparse_tensor=True``.
         plan_kwargs
             Keyword args for :class:`~scvi.train.SemiSupervisedTrainingPlan`. Keyword arguments passed to
             `train()` will overwrite values present in `plan_kwargs`, when appropriate.
         **trainer_kwargs
-            Other keyword args for :class:`~scvi.train.Trainer`.
+            Other keyword args for :class:`~scvi.train.Trainer`. Passing a DDP
+            ``strategy`` (e.g. ``strategy="ddp_find_unused_parameters_true"``) shards the
+            labelled and unlabelled cells across replicas. Mixed precision training can be
+            enabled with ``precision="bf16-mixed"``, in which case the classifier head is
+            still evaluated in full precision.
         """
         if max_epochs is None:
             max_epochs = get_max_epochs_heuristic(self.adata.n_obs)
 
             if self.was_pretrained:
-                max_epochs = int(np.min([10, np.max([2, round(max_epochs / 3.0)])]))
+                max_epochs = min(10, max(2, (max_epochs + 1) // 3))
 
         logger.info(f"Training for {max_epochs} epochs.")
 
@@ -429,6 +545,10 @@ class SCANVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseMinifiedModeModelClass):
             validation_size=validation_size,
             shuffle_set_split=shuffle_set_split,
             n_samples_per_label=n_samples_per_label,
+            load_sparse_tensor=load_sparse_tensor,
+            distributed_sampler=use_distributed_sampler(
+                trainer_kwargs.get("strategy", None)
+            ),
             batch_size=batch_size,
             **datasplitter_kwargs,
         )
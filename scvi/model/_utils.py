@@ -55,7 +55,9 @@ def get_max_epochs_heuristic(
     `int`
         A heuristic for the default number of maximum epochs.
     """
-    max_epochs = min(round((decay_at_n_obs / n_obs) * epochs_cap), epochs_cap)
+    # integer arithmetic (rounding half up) keeps the heuristic free of floating
+    # point rounding
+    max_epochs = min((decay_at_n_obs * epochs_cap + n_obs // 2) // n_obs, epochs_cap)
     max_epochs = max(max_epochs, 1)
 
     if max_epochs == 1:
@@ -12,7 +12,7 @@ from scvi.module.base import LossOutput, auto_move_data
 from scvi.nn import Decoder, Encoder
 
 from ._classifier import Classifier
-from ._utils import broadcast_labels
+from ._utils import broadcast_labels, disable_autocast
 from ._vae import VAE
 
 
@@ -220,18 +220,20 @@ class SCANVAE(VAE):
         qz, z = self.z_encoder(encoder_input, batch_index, *categorical_input)
         z = qz.loc if use_posterior_mean else z
 
-        if self.use_labels_groups:
-            w_g = self.classifier_groups(z)
-            unw_y = self.classifier(z)
-            w_y = torch.zeros_like(unw_y)
-            for i, group_index in enumerate(self.groups_index):
-                unw_y_g = unw_y[:, group_index]
-                w_y[:, group_index] = unw_y_g / (
-                    unw_y_g.sum(dim=-1, keepdim=True) + 1e-8
-                )
-                w_y[:, group_index] *= w_g[:, [i]]
-        else:
-            w_y = self.classifier(z)
+        # keep the softmax head in full precision under mixed precision training
+        with disable_autocast(z) as z:
+            if self.use_labels_groups:
+                w_g = self.classifier_groups(z)
+                unw_y = self.classifier(z)
+                w_y = torch.zeros_like(unw_y)
+                for i, group_index in enumerate(self.groups_index):
+                    unw_y_g = unw_y[:, group_index]
+                    w_y[:, group_index] = unw_y_g / (
+                        unw_y_g.sum(dim=-1, keepdim=True) + 1e-8
+                    )
+                    w_y[:, group_index] *= w_g[:, [i]]
+            else:
+                w_y = self.classifier(z)
         return w_y
 
     @auto_move_data
@@ -337,7 +339,8 @@ class SCANVAE(VAE):
                 kl_local=kl_locals,
             )
 
-        probs = self.classifier(z1)
+        with disable_autocast(z1) as z1_fp32:
+            probs = self.classifier(z1_fp32)
         reconst_loss += loss_z1_weight + (
             (loss_z1_unweight).view(self.n_labels, -1).t() * probs
         ).sum(dim=1)
@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+
 import torch
 
 from scvi.nn import one_hot
@@ -34,6 +36,21 @@ def broadcast_labels(y, *o, n_broadcast=-1):
     return (ys,) + new_o
 
 
+@contextmanager
+def disable_autocast(x: torch.Tensor):
+    """Disables autocasting on the device of ``x`` if it is currently enabled.
+
+    Yields ``x`` cast to full precision when autocasting was enabled, and ``x``
+    unchanged otherwise. Used to keep numerically sensitive layers (e.g. softmax
+    classifier heads) in full precision when training with mixed precision.
+    """
+    if torch.is_autocast_enabled() or torch.is_autocast_cpu_enabled():
+        with torch.autocast(device_type=x.device.type, enabled=False):
+            yield x.float()
+    else:
+        yield x
+
+
 def enumerate_discrete(x, y_dim):
     """Enumerate discrete variables."""
 
@@ -1,3 +1,4 @@
+import warnings
 from collections import OrderedDict
 from functools import partial
 from inspect import signature
@@ -15,7 +16,7 @@ from pyro.nn import PyroModule
 from torch.optim.lr_scheduler import ReduceLROnPlateau
 from torchmetrics import AUROC, Accuracy, F1Score
 
-from scvi import METRIC_KEYS, REGISTRY_KEYS
+from scvi import METRIC_KEYS, REGISTRY_KEYS, settings
 from scvi.autotune._types import Tunable, TunableMixin
 from scvi.module import Classifier
 from scvi.module.base import (
@@ -77,6 +78,24 @@ def _compute_kl_weight(
     return max_kl_weight
 
 
+def _compile_module_forward(
+    module: torch.nn.Module, **compile_kwargs
+) -> Optional[Callable]:
+    """Compiles the forward method of `module` with :func:`torch.compile`.
+
+    The module itself is not replaced, so parameter names and state dicts are unchanged.
+    Returns `None` if :func:`torch.compile` is not available.
+    """
+    if not hasattr(torch, "compile"):
+        warnings.warn(
+            "`torch.compile` requires PyTorch 2.0 or later, falling back to eager execution.",
+            UserWarning,
+            stacklevel=settings.warnings_stacklevel,
+        )
+        return None
+    return torch.compile(module.forward, **compile_kwargs)
+
+
 class TrainingPlan(TunableMixin, pl.LightningModule):
     """Lightning module task to train scvi-tools modules.
 
@@ -133,6 +152,12 @@ class TrainingPlan(TunableMixin, pl.LightningModule):
         Maximum scaling factor on KL divergence during training.
     min_kl_weight
         Minimum scaling factor on KL divergence during training.
+    compile
+        If `True`, the forward pass of `module` is compiled with :func:`torch.compile`
+        on its first call. Falls back to eager execution if :func:`torch.compile` is not
+        available (PyTorch < 2.0).
+    compile_kwargs
+        Keyword arguments passed into :func:`torch.compile`.
     **loss_kwargs
         Keyword args to pass to the loss method of the `module`.
         `kl_weight` should not be passed here and is handled automatically.
@@ -159,6 +184,8 @@ class TrainingPlan(TunableMixin, pl.LightningModule):
         lr_min: Tunable[float] = 0,
         max_kl_weight: Tunable[float] = 1.0,
         min_kl_weight: Tunable[float] = 0.0,
+        compile: bool = False,
+        compile_kwargs: Optional[dict] = None,
         **loss_kwargs,
     ):
         super().__init__()
@@ -188,6 +215,12 @@ class TrainingPlan(TunableMixin, pl.LightningModule):
         self._n_obs_training = None
         self._n_obs_validation = None
 
+        # the forward pass is compiled lazily on the first call, as compiled functions
+        # cannot be pickled, e.g. when spawning processes for distributed training
+        self._compile = compile
+        self._compile_kwargs = compile_kwargs or {}
+        self._compiled_forward = None
+
         # automatic handling of kl weight
         self._loss_args = set(signature(self.module.loss).parameters.keys())
         if "kl_weight" in self._loss_args:
@@ -280,6 +313,14 @@ class TrainingPlan(TunableMixin, pl.LightningModule):
 
     def forward(self, *args, **kwargs):
         """Passthrough to the module's forward method."""
+        if self._compile:
+            # only attempt to compile once, even if falling back to eager execution
+            self._compile = False
+            self._compiled_forward = _compile_module_forward(
+                self.module, **self._compile_kwargs
+            )
+        if self._compiled_forward is not None:
+            return self._compiled_forward(*args, **kwargs)
         return self.module(*args, **kwargs)
 
     @torch.inference_mode()
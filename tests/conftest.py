@@ -49,16 +49,14 @@ def pytest_configure(config):
 def pytest_collection_modifyitems(config, items):
     """Docstring for pytest_collection_modifyitems."""
     run_internet = config.getoption("--internet-tests")
+    run_optional = config.getoption("--optional")
     skip_internet = pytest.mark.skip(reason="need --internet-tests option to run")
+    skip_optional = pytest.mark.skip(reason="need --optional option to run")
     for item in items:
         # All tests marked with `pytest.mark.internet` get skipped unless
         # `--internet-tests` passed
         if not run_internet and ("internet" in item.keywords):
             item.add_marker(skip_internet)
-
-    run_optional = config.getoption("--optional")
-    skip_optional = pytest.mark.skip(reason="need --optional option to run")
-    for item in items:
         # All tests marked with `pytest.mark.optional` get skipped unless
         # `--optional` passed
         if not run_optional and ("optional" in item.keywords):
@@ -21,6 +21,31 @@ def test_deprecated_munkres():
     assert (assignment == np.array([[0, 3], [1, 1], [2, 2], [3, 0]])).all()
 
 
+def test_log_zinb_positive_matches_masked_sum():
+    torch.manual_seed(0)
+    theta = 1.0 + torch.rand(size=(64, 10))
+    mu = 5.0 * torch.rand_like(theta)
+    pi = torch.randn_like(theta)
+    x = torch.randint_like(mu, high=5)
+    eps = 1e-8
+
+    softplus_pi = torch.nn.functional.softplus(-pi)
+    log_theta_mu_eps = torch.log(theta + mu + eps)
+    pi_theta_log = -pi + theta * (torch.log(theta + eps) - log_theta_mu_eps)
+    case_zero = torch.nn.functional.softplus(pi_theta_log) - softplus_pi
+    case_non_zero = (
+        -softplus_pi
+        + pi_theta_log
+        + x * (torch.log(mu + eps) - log_theta_mu_eps)
+        + torch.lgamma(x + theta)
+        - torch.lgamma(theta)
+        - torch.lgamma(x + 1)
+    )
+    expected = (x < eps).float() * case_zero + (x > eps).float() * case_non_zero
+
+    torch.testing.assert_close(log_zinb_positive(x, mu, theta, pi, eps=eps), expected)
+
+
 def test_zinb_distribution():
     theta = 100.0 + torch.rand(size=(2,))
     mu = 15.0 * torch.ones_like(theta)
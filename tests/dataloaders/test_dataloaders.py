@@ -93,6 +93,14 @@ def test_anndataloader_distributed_sampler_init():
         )
 
 
+def test_anndataloader_sparse_tensor_workers():
+    adata = scvi.data.synthetic_iid(sparse_format="csr_matrix")
+    manager = generic_setup_adata_manager(adata)
+
+    with pytest.raises(ValueError):
+        scvi.dataloaders.AnnDataLoader(manager, load_sparse_tensor=True, num_workers=1)
+
+
 def multiprocessing_worker(
     rank: int, world_size: int, manager: scvi.data.AnnDataManager, save_path: str
 ):
@@ -120,3 +128,145 @@ def test_anndataloader_distributed_sampler(save_path: str, num_processes: int =
         nprocs=num_processes,
         join=True,
     )
+
+
+def semisupervised_multiprocessing_worker(
+    rank: int, world_size: int, manager: scvi.data.AnnDataManager, save_path: str
+):
+    torch.distributed.init_process_group(
+        "gloo",
+        init_method=f"file://{save_path}/dist_file_semisupervised",
+        rank=rank,
+        world_size=world_size,
+    )
+
+    dl = scvi.dataloaders.SemiSupervisedDataLoader(manager, distributed_sampler=True)
+    assert isinstance(dl.sampler, scvi.dataloaders.BatchDistributedSampler)
+    for loader in dl.dataloaders:
+        assert isinstance(loader.sampler, scvi.dataloaders.BatchDistributedSampler)
+
+    return
+
+
+@pytest.mark.optional
+def test_semisuperviseddataloader_distributed_sampler(
+    save_path: str, num_processes: int = 2
+):
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+    manager = scvi.model.SCANVI(adata).adata_manager
+
+    torch.multiprocessing.spawn(
+        semisupervised_multiprocessing_worker,
+        args=(num_processes, manager, save_path),
+        nprocs=num_processes,
+        join=True,
+    )
+
+
+def concat_epochs_multiprocessing_worker(
+    rank: int,
+    world_size: int,
+    manager: scvi.data.AnnDataManager,
+    save_path: str,
+    n_small: int,
+):
+    torch.distributed.init_process_group(
+        "gloo",
+        init_method=f"file://{save_path}/dist_file_concat_epochs",
+        rank=rank,
+        world_size=world_size,
+    )
+
+    dl = scvi.dataloaders.ConcatDataLoader(
+        manager,
+        indices_list=[np.arange(manager.adata.n_obs), np.arange(n_small)],
+        shuffle=True,
+        batch_size=n_small // world_size,
+        distributed_sampler=True,
+    )
+
+    epochs = []
+    for epoch in range(2):
+        # lightning only calls `set_epoch` on the exposed sampler
+        dl.sampler.set_epoch(epoch)
+        passes = [
+            tuple(small[REGISTRY_KEYS.BATCH_KEY].squeeze(-1).tolist())
+            for _, small in dl
+        ]
+        # the labelled stream is reshuffled on every pass
+        assert len(set(passes)) > 1
+        epochs.append(passes)
+
+    # and differs across epochs
+    assert epochs[0] != epochs[1]
+
+    return
+
+
+@pytest.mark.optional
+def test_concatdataloader_distributed_sampler_epochs(
+    save_path: str, num_processes: int = 2, n_small: int = 10
+):
+    adata = scvi.data.synthetic_iid()
+    adata.obs["indices"] = np.arange(adata.n_obs)
+    manager = generic_setup_adata_manager(adata, batch_key="indices")
+
+    torch.multiprocessing.spawn(
+        concat_epochs_multiprocessing_worker,
+        args=(num_processes, manager, save_path, n_small),
+        nprocs=num_processes,
+        join=True,
+    )
+
+
+def test_concatdataloader_cycles_with_reshuffling(n_small: int = 10):
+    adata = scvi.data.synthetic_iid()
+    adata.obs["indices"] = np.arange(adata.n_obs)
+    manager = generic_setup_adata_manager(adata, batch_key="indices")
+
+    dl = scvi.dataloaders.ConcatDataLoader(
+        manager,
+        indices_list=[np.arange(adata.n_obs), np.arange(n_small)],
+        shuffle=True,
+        batch_size=n_small,
+    )
+    assert len(dl) == adata.n_obs // n_small
+
+    passes = []
+    for _, small_tensors in dl:
+        indices = small_tensors[REGISTRY_KEYS.BATCH_KEY].squeeze(-1).tolist()
+        assert sorted(indices) == list(range(n_small))
+        passes.append(indices)
+
+    assert len(passes) == len(dl)
+    # minibatches of the smaller dataloader are redrawn on every pass
+    assert len({tuple(p) for p in passes}) > 1
+
+
+def test_concatdataloader_cycles_with_workers(n_small: int = 10):
+    adata = scvi.data.synthetic_iid()
+    adata.obs["indices"] = np.arange(adata.n_obs)
+    manager = generic_setup_adata_manager(adata, batch_key="indices")
+
+    dl = scvi.dataloaders.ConcatDataLoader(
+        manager,
+        indices_list=[np.arange(adata.n_obs), np.arange(n_small)],
+        shuffle=True,
+        batch_size=n_small,
+        num_workers=1,
+    )
+    # workers of the cycled data loader are kept alive across passes
+    assert not dl.largest_dl.persistent_workers
+    assert dl.dataloaders[1].persistent_workers
+
+    passes = []
+    for _, small_tensors in dl:
+        indices = small_tensors[REGISTRY_KEYS.BATCH_KEY].squeeze(-1).tolist()
+        assert sorted(indices) == list(range(n_small))
+        passes.append(tuple(indices))
+
+    assert len(passes) == len(dl)
+    assert len(set(passes)) > 1
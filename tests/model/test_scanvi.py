@@ -1,4 +1,11 @@
+import numpy as np
+import torch
+
 import scvi
+from scvi.model._scanvi import (
+    _PREDICT_MAX_BATCH_SIZE_MULTIPLE,
+    _PREDICT_MEMORY_SAFETY_FACTOR,
+)
 
 
 def test_scanvi_predict_use_posterior_mean():
@@ -12,3 +19,142 @@ def test_scanvi_predict_use_posterior_mean():
 
     _ = model.predict(use_posterior_mean=True)
     _ = model.predict(use_posterior_mean=False)
+
+
+def test_scanvi_mixed_precision():
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+
+    model = scvi.model.SCANVI(adata)
+    model.train(max_epochs=1, accelerator="cpu", precision="bf16-mixed")
+
+    _ = model.predict()
+    _ = model.predict(soft=True)
+
+    # the classifier head stays in full precision under autocast
+    x = torch.from_numpy(adata.X[:10]).float()
+    batch_index = torch.zeros((10, 1))
+    with torch.autocast("cpu", dtype=torch.bfloat16):
+        probs = model.module.classify(x, batch_index=batch_index)
+    assert probs.dtype == torch.float32
+
+
+def test_scanvi_predict_labels_match_soft_argmax():
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+
+    model = scvi.model.SCANVI(adata)
+    model.train(max_epochs=1)
+
+    hard = model.predict()
+    soft = model.predict(soft=True)
+    assert hard.shape == (adata.n_obs,)
+    assert hard.dtype.kind == "U"
+    assert (hard == soft.idxmax(axis=1).to_numpy()).all()
+
+
+def test_scanvi_predict_reflects_updated_data():
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+
+    model = scvi.model.SCANVI(adata)
+    model.train(max_epochs=1)
+
+    first = model.predict(soft=True)
+    adata.X = np.zeros_like(adata.X)
+    second = model.predict(soft=True)
+    assert not np.allclose(first.to_numpy(), second.to_numpy())
+
+
+def test_scanvi_predict_default_batch_size():
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+
+    model = scvi.model.SCANVI(adata)
+    model.train(max_epochs=1)
+    # the minibatch size is only scaled to free memory on GPU
+    assert model._get_predict_batch_size(adata.n_obs) == scvi.settings.batch_size
+    assert model.predict().shape == (adata.n_obs,)
+
+
+def test_scanvi_predict_batch_size_gpu_memory(monkeypatch):
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+    model = scvi.model.SCANVI(adata)
+
+    free_memory = 0
+    monkeypatch.setattr(scvi.model.SCANVI, "device", "cuda")
+    monkeypatch.setattr(
+        torch.cuda, "mem_get_info", lambda device=None: (free_memory, free_memory)
+    )
+    bytes_per_obs = 4 * adata.n_vars * _PREDICT_MEMORY_SAFETY_FACTOR
+    max_batch_size = _PREDICT_MAX_BATCH_SIZE_MULTIPLE * scvi.settings.batch_size
+
+    # never smaller than the default minibatch size
+    assert model._get_predict_batch_size(10**6) == scvi.settings.batch_size
+
+    # scaled to the free memory
+    free_memory = bytes_per_obs * (scvi.settings.batch_size + 1)
+    assert model._get_predict_batch_size(10**6) == scvi.settings.batch_size + 1
+
+    # never larger than the upper bound
+    free_memory = bytes_per_obs * 10**9
+    assert model._get_predict_batch_size(10**6) == max_batch_size
+
+    # and capped at the number of cells to predict
+    assert model._get_predict_batch_size(50) == 50
+
+
+def test_scanvi_from_scvi_model_share_weights():
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCVI.setup_anndata(adata, labels_key="labels")
+    scvi_model = scvi.model.SCVI(adata)
+    scvi_model.train(max_epochs=1)
+
+    scanvi_model = scvi.model.SCANVI.from_scvi_model(
+        scvi_model, "label_0", share_weights=True
+    )
+    assert scanvi_model.module.z_encoder is scvi_model.module.z_encoder
+    assert scanvi_model.module.decoder is scvi_model.module.decoder
+    assert scanvi_model.module.px_r is scvi_model.module.px_r
+
+    scanvi_model.train(max_epochs=1)
+    _ = scanvi_model.predict()
+
+
+def test_scanvi_predict_quantize():
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+
+    model = scvi.model.SCANVI(adata)
+    model.train(max_epochs=1, accelerator="cpu")
+
+    soft = model.predict(soft=True)
+    soft_quantized = model.predict(soft=True, quantize=True)
+    assert soft_quantized.shape == soft.shape
+    assert (soft_quantized - soft).abs().to_numpy().max() < 0.1
+    # the full precision module is not modified
+    assert type(model.module.classifier.classifier[-2]) is torch.nn.Linear
+    # only the submodules used for classification are copied and quantized
+    quantized = model._get_quantized_module()
+    assert quantized.decoder is model.module.decoder
+    assert type(quantized.classifier.classifier[-2]) is not torch.nn.Linear
+
+    # the quantized copy follows later changes to the weights
+    with torch.no_grad():
+        model.module.classifier.classifier[-2].weight.zero_()
+        model.module.classifier.classifier[-2].bias.zero_()
+    soft_quantized = model.predict(soft=True, quantize=True)
+    assert np.allclose(soft_quantized.to_numpy(), 1 / soft.shape[1])
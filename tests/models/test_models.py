@@ -827,6 +827,35 @@ def test_backed_anndata_scvi(save_path):
     model.get_elbo()
 
 
+def test_backed_anndata_scanvi(save_path):
+    adata = scvi.data.synthetic_iid(sparse_format="csr_matrix")
+    path = os.path.join(save_path, "test_data_scanvi.h5ad")
+    adata.write_h5ad(path)
+    adata = anndata.read_h5ad(path, backed="r+")
+    SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0", batch_key="batch"
+    )
+
+    model = SCANVI(adata, n_latent=5)
+    model.train(1, train_size=0.5, load_sparse_tensor=True)
+    assert model.is_trained is True
+    _ = model.predict()
+
+    model = SCANVI(adata, n_latent=5)
+    model.train(
+        1, train_size=0.5, datasplitter_kwargs={"num_workers": 2, "pin_memory": True}
+    )
+    assert model.is_trained is True
+
+    with pytest.raises(ValueError):
+        model.train(
+            1,
+            train_size=0.5,
+            load_sparse_tensor=True,
+            datasplitter_kwargs={"num_workers": 2},
+        )
+
+
 @pytest.mark.parametrize(
     "data",
     [
@@ -1,4 +1,7 @@
+import pickle
+
 import pytest
+import torch
 
 import scvi
 from scvi import METRIC_KEYS
@@ -99,3 +102,53 @@ def test_semisupervisedtrainingplan_metrics():
             METRIC_KEYS.CLASSIFICATION_LOSS_KEY,
         ]:
             assert f"{mode}_{metric}" in model.history_
+
+
+def test_training_plan_compile_forward(synthetic_adata, monkeypatch):
+    compiled_calls = []
+
+    def compile(fn, **kwargs):
+        def compiled(*args, **kwargs):
+            compiled_calls.append(1)
+            return fn(*args, **kwargs)
+
+        return compiled
+
+    monkeypatch.setattr(torch, "compile", compile, raising=False)
+
+    SCVI.setup_anndata(synthetic_adata)
+    model = SCVI(synthetic_adata)
+    tensors = next(iter(model._make_data_loader(synthetic_adata, batch_size=8)))
+
+    plan = TrainingPlan(model.module, compile=True)
+    # the forward pass is only compiled on the first call
+    assert plan._compiled_forward is None
+    _ = pickle.dumps(plan)
+
+    plan.forward(tensors)
+    plan.forward(tensors)
+    assert plan._compiled_forward is not None
+    assert len(compiled_calls) == 2
+
+    # falls back to eager execution and only attempts to compile once
+    monkeypatch.delattr(torch, "compile")
+    plan = TrainingPlan(model.module, compile=True)
+    with pytest.warns(UserWarning):
+        plan.forward(tensors)
+    assert not plan._compile
+    plan.forward(tensors)
+    assert plan._compiled_forward is None
+
+
+@pytest.mark.optional
+def test_semisupervised_training_plan_compile():
+    adata = scvi.data.synthetic_iid()
+    scvi.model.SCANVI.setup_anndata(
+        adata, labels_key="labels", unlabeled_category="label_0"
+    )
+    model = scvi.model.SCANVI(adata)
+    model.train(max_epochs=1, plan_kwargs={"compile": True})
+
+    _ = model.predict()
+    # compiling does not change parameter names
+    assert all(not k.startswith("_orig_mod") for k in model.module.state_dict())